@@ -1,28 +1,27 @@
 import streamlit as st
 import numpy as np
-import sounddevice as sd
 import time
 import threading
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
 from queue import Queue
+from collections import deque
+from itertools import islice
 from pathlib import Path
-from resemblyzer import VoiceEncoder, preprocess_wav
 from datetime import datetime
-import pandas as pd
-import matplotlib.pyplot as plt
-import plotly.express as px
-import plotly.graph_objects as go
-import os
+import voice_inference
+try:
+    import simsimd  # Optional SIMD cosine kernels
+except ImportError:
+    simsimd = None
 
-# Page configuration
-st.set_page_config(
-    page_title="Voice Recognition Security Dashboard",
-    page_icon="🔊",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+# SimSIMD scores half-precision natively; plain NumPy matmul needs float32
+REF_DTYPE = np.float16 if simsimd is not None else np.float32
 
 # Custom CSS for streamlined design
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     .main-header {
         background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
@@ -67,7 +66,15 @@ st.markdown("""
         margin: 0.5rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Page header
+HEADER_HTML = """
+<div class="main-header">
+    🔊 Voice Recognition Security Dashboard
+    <br><small>Real-Time Scam Prevention System</small>
+</div>
+"""
 
 # Voice Recognition System Integration
 class StreamlinedVoiceSystem:
@@ -75,25 +82,43 @@ class StreamlinedVoiceSystem:
         self.FS = 16000
         self.WIN_SEC = 2.0
         self.HOP_SEC = 1.0
+        self.RING_SEC = 8.0  # Must hold WIN_SEC + (EMBED_BATCH - 1) * HOP_SEC
         self.THRESHOLD = 0.75
+        self.SHORTCUT_MARGIN = 0.1
+        self.EMBED_WORKERS = 1
+        self.EMBED_BATCH = 4
+        self.POOL_RESTART_LIMIT = 3
         self.REF_DIR = Path("reference_voices")
+        self.CACHE_DIR = self.REF_DIR / ".cache"
         
         # Initialize encoder
+        from resemblyzer import VoiceEncoder
         self.enc = VoiceEncoder()
         self.refs = {}
+        self.emb_cache = {}
+        
+        # Reference names and their embeddings stacked row-wise for scoring,
+        # published together so readers never pair names with the wrong rows
+        self.ref_index = ([], np.empty((0, 0), dtype=REF_DTYPE))
+        self.last_match_idx = 0
         
-        # Audio processing
-        self.audio_queue = Queue()
+        # Audio processing: the stream callback is the only writer of the
+        # ring and write_pos, and the scheduler only reads, so no lock is needed
+        self.audio_ring = np.zeros(int(self.RING_SEC * self.FS), dtype=np.float32)
+        self.write_pos = 0
         self.result_queue = Queue()
         self.is_monitoring = False
+        self.stats_lock = threading.Lock()
         
-        # Statistics
-        self.session_stats = {
-            'total_calls': 0,
-            'authorized_calls': 0,
-            'blocked_calls': 0,
-            'start_time': None
-        }
+        # Live inference runs in worker processes that own their own encoder
+        self.executor = None
+        self.in_flight = set()
+        self.pool_failures = 0
+        self.monitor_error = None
+        
+        # Statistics: total, authorized and blocked call counts
+        self.call_counts = np.zeros(3, dtype=np.int64)
+        self.start_time = None
         
         # Load references
         self.load_references()
@@ -103,9 +128,10 @@ class StreamlinedVoiceSystem:
         try:
             if self.REF_DIR.exists():
                 self.refs = {
-                    wav.stem: self.enc.embed_utterance(preprocess_wav(wav))
+                    wav.stem: self.embed_reference(wav)
                     for wav in self.REF_DIR.glob("*.wav")
                 }
+                self.rebuild_ref_matrix()
                 return len(self.refs) > 0
             else:
                 self.REF_DIR.mkdir(exist_ok=True)
@@ -114,44 +140,204 @@ class StreamlinedVoiceSystem:
             st.error(f"Error loading references: {str(e)}")
             return False
     
-    def cosine_similarity(self, a, b):
-        """Calculate cosine similarity"""
-        return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
+    def embed_reference(self, wav_path, audio_bytes=None):
+        """Embed a reference wav, reusing the cached embedding for identical audio"""
+        if audio_bytes is None:
+            audio_bytes = wav_path.read_bytes()
+        key = hashlib.sha1(audio_bytes).hexdigest()
+        if key in self.emb_cache:
+            return self.emb_cache[key]
+        
+        cache_path = self.CACHE_DIR / f"{key}.npy"
+        if cache_path.exists():
+            embedding = np.load(cache_path)
+        else:
+            from resemblyzer import preprocess_wav
+            embedding = self.enc.embed_utterance(preprocess_wav(wav_path))
+            self.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            np.save(cache_path, embedding)
+        
+        self.emb_cache[key] = embedding
+        return embedding
+    
+    def normalize_embedding(self, embedding):
+        """Return a unit-length float32 copy of an embedding"""
+        e = np.array(embedding, dtype=np.float32)
+        e /= np.linalg.norm(e) + 1e-12
+        return e
+    
+    def rebuild_ref_matrix(self):
+        """Stack unit-norm reference embeddings into a contiguous REF_DTYPE matrix"""
+        if self.refs:
+            names = list(self.refs.keys())
+            matrix = np.stack(
+                [self.normalize_embedding(e) for e in self.refs.values()]
+            ).astype(REF_DTYPE)
+        else:
+            names = []
+            matrix = np.empty((0, 0), dtype=REF_DTYPE)
+        self.ref_index = (names, matrix)
+    
+    def append_ref_embedding(self, name, embedding):
+        """Add or replace a single row of the reference matrix"""
+        row = self.normalize_embedding(embedding).astype(REF_DTYPE)
+        names, matrix = self.ref_index
+        if name in names:
+            matrix[names.index(name)] = row
+        elif names:
+            self.ref_index = (names + [name], np.vstack((matrix, row)))
+        else:
+            self.ref_index = ([name], row[np.newaxis, :])
+    
+    def clear_references(self):
+        """Remove all reference voices"""
+        self.refs = {}
+        self.rebuild_ref_matrix()
+        self.emb_cache = {}
+        for wav_file in self.REF_DIR.glob("*.wav"):
+            wav_file.unlink()
+        for npy_file in self.CACHE_DIR.glob("*.npy"):
+            npy_file.unlink()
+    
+    def match_embedding(self, embedding):
+        """Return the best matching reference name and its similarity score"""
+        names, matrix = self.ref_index
+        if not names:
+            return None, 0
+        
+        query = np.asarray(embedding, dtype=np.float32)
+        query_norm = float(np.sqrt(np.dot(query, query))) + 1e-12
+        
+        # The last matched caller usually keeps talking, so a clear win on
+        # that row skips scoring the remaining references
+        last = self.last_match_idx
+        if last < len(matrix):
+            quick_score = float(np.dot(matrix[last], query)) / query_norm
+            if quick_score > self.THRESHOLD + self.SHORTCUT_MARGIN:
+                return names[last], quick_score
+        
+        if simsimd is not None:
+            scores = 1.0 - np.asarray(
+                simsimd.cdist(query.astype(REF_DTYPE).reshape(1, -1), matrix, metric='cosine')
+            )[0]
+            idx = int(np.argmax(scores))
+            best_score = float(scores[idx])
+        else:
+            # References are unit-norm, so one matrix-vector product ranks them all;
+            # argmax ignores the query's scale, so divide by its norm only once
+            scores = matrix @ query
+            idx = int(np.argmax(scores))
+            best_score = float(scores[idx]) / query_norm
+        
+        if best_score <= 0:
+            return None, 0
+        self.last_match_idx = idx
+        return names[idx], best_score
     
     def audio_callback(self, indata, frames, t, status):
         """Audio stream callback"""
         if status:
             print(f"Audio status: {status}")
-        self.audio_queue.put(indata.copy())
+        samples = indata[:, 0]
+        self.write_to_ring(self.audio_ring, self.write_pos % len(self.audio_ring), samples)
+        self.write_pos += len(samples)
+    
+    def write_to_ring(self, ring, write_idx, samples):
+        """Copy samples into a ring buffer starting at write_idx"""
+        size = len(ring)
+        n = len(samples)
+        if n >= size:
+            # Only the newest samples fit; place them so they still end where
+            # the whole block would have, which read_window relies on
+            write_idx = (write_idx + n) % size
+            samples = samples[-size:]
+            n = size
+        
+        end = write_idx + n
+        if end <= size:
+            ring[write_idx:end] = samples
+        else:
+            split = size - write_idx
+            ring[write_idx:] = samples[:split]
+            ring[:end - size] = samples[split:]
+    
+    def read_window(self, end_pos, n):
+        """Copy the n samples that precede end_pos out of the audio ring"""
+        end = end_pos % len(self.audio_ring)
+        start = end - n
+        if start >= 0:
+            return self.audio_ring[start:end].copy()
+        return np.concatenate((self.audio_ring[start:], self.audio_ring[:end]))
     
     def worker_thread(self):
-        """Background processing thread"""
+        """Background scheduler feeding audio windows to the embedding pool"""
         win_samples = int(self.WIN_SEC * self.FS)
-        window = np.zeros((win_samples, 1), dtype=np.float32)
+        hop_samples = int(self.HOP_SEC * self.FS)
+        read_pos = self.write_pos
         
         while self.is_monitoring:
             try:
-                chunk = self.audio_queue.get(timeout=1)
-                
-                # Update sliding window
-                window = np.roll(window, -len(chunk), axis=0)
-                window[-len(chunk):] = chunk
+                # Embed once per hop of new audio; sleep until it has arrived
+                available = self.write_pos - read_pos
+                if available < 0:
+                    # The ring was reset under us; start again from the new position
+                    read_pos = self.write_pos
+                    continue
+                if available < hop_samples:
+                    time.sleep((hop_samples - available) / self.FS)
+                    continue
                 
-                if self.audio_queue.qsize():
+                # Wait for a free embedding worker; newer audio keeps accumulating
+                self.in_flight = {f for f in self.in_flight if not f.done()}
+                if len(self.in_flight) >= self.EMBED_WORKERS:
+                    wait(self.in_flight, timeout=self.HOP_SEC, return_when=FIRST_COMPLETED)
                     continue
                 
-                # Extract embedding
-                embedding = self.enc.embed_utterance(window.flatten())
+                # Copy out one window per pending hop (up to a batch), oldest first,
+                # and hand them to the pool together
+                read_pos = self.write_pos
+                n_windows = min(available // hop_samples, self.EMBED_BATCH)
+                windows = [
+                    self.read_window(read_pos - i * hop_samples, win_samples)
+                    for i in reversed(range(n_windows))
+                ]
+                future = self.executor.submit(voice_inference.embed_windows, windows)
+                future.add_done_callback(self.handle_embedding)
+                self.in_flight.add(future)
                 
+            except BrokenProcessPool as e:
+                if not self.is_monitoring:
+                    continue
+                # A worker died; replace the pool with growing pauses, and give
+                # up once it keeps failing (e.g. the encoder cannot load)
+                self.pool_failures += 1
+                if self.pool_failures >= self.POOL_RESTART_LIMIT:
+                    self.monitor_error = f"Inference worker failed {self.pool_failures} times: {e}"
+                    print(self.monitor_error)
+                    self.is_monitoring = False
+                    self.close_stream()
+                    self.executor.shutdown(wait=False, cancel_futures=True)
+                    self.executor = None
+                    break
+                print(f"Inference pool failed, restarting: {e}")
+                time.sleep(self.HOP_SEC * 2 ** self.pool_failures)
+                self.start_executor()
+                continue
+            except Exception as e:
+                if self.is_monitoring:
+                    print(f"Processing error: {e}")
+                continue
+    
+    def handle_embedding(self, future):
+        """Score embeddings returned by the inference pool and record the results"""
+        if future.cancelled():
+            return
+        try:
+            embeddings = future.result()
+            self.pool_failures = 0
+            for embedding in embeddings:
                 # Find best match
-                best_match = None
-                best_score = 0
-                
-                for name, ref_embedding in self.refs.items():
-                    similarity = self.cosine_similarity(embedding, ref_embedding)
-                    if similarity > best_score:
-                        best_match = name
-                        best_score = similarity
+                best_match, best_score = self.match_embedding(embedding)
                 
                 # Create result
                 result = {
@@ -161,30 +347,58 @@ class StreamlinedVoiceSystem:
                     'status': 'Authorized' if best_score >= self.THRESHOLD else 'Blocked'
                 }
                 
-                # Update statistics
-                self.session_stats['total_calls'] += 1
-                if result['status'] == 'Authorized':
-                    self.session_stats['authorized_calls'] += 1
-                else:
-                    self.session_stats['blocked_calls'] += 1
-                
-                # Put result in queue
-                self.result_queue.put(result)
-                
-                time.sleep(self.HOP_SEC)
-                
-            except Exception as e:
-                if self.is_monitoring:
-                    print(f"Processing error: {e}")
-                continue
+                self.record_result(result)
+        except Exception as e:
+            if self.is_monitoring:
+                print(f"Processing error: {e}")
+    
+    def record_result(self, result):
+        """Update running statistics and publish a result"""
+        with self.stats_lock:
+            self.call_counts[0] += 1
+            self.call_counts[1 if result['status'] == 'Authorized' else 2] += 1
+        
+        self.result_queue.put(result)
+    
+    def call_counts_snapshot(self):
+        """Consistent copy of the total, authorized and blocked counts"""
+        with self.stats_lock:
+            return self.call_counts.tolist()
+    
+    @property
+    def session_stats(self):
+        """Snapshot of the running call statistics"""
+        total, authorized, blocked = self.call_counts_snapshot()
+        return {
+            'total_calls': total,
+            'authorized_calls': authorized,
+            'blocked_calls': blocked,
+            'start_time': self.start_time
+        }
+    
+    def block_rate(self):
+        """Percentage of processed calls that were blocked"""
+        total, _, blocked = self.call_counts_snapshot()
+        return (blocked / total) * 100 if total else 0.0
     
     def start_monitoring(self):
         """Start real-time monitoring"""
+        # The system is shared by every session; a second start would add
+        # another stream writing the ring under the running scheduler
+        if self.is_monitoring:
+            return True
         try:
             self.is_monitoring = True
-            self.session_stats['start_time'] = datetime.now()
+            self.start_time = datetime.now()
+            self.pool_failures = 0
+            self.monitor_error = None
+            
+            # Start audio stream on a silent ring (PortAudio is loaded here,
+            # not at import, so spawned inference workers never initialize it)
+            import sounddevice as sd
             
-            # Start audio stream
+            self.audio_ring[:] = 0
+            self.write_pos = 0
             self.stream = sd.InputStream(
                 channels=1,
                 samplerate=self.FS,
@@ -193,7 +407,9 @@ class StreamlinedVoiceSystem:
             )
             self.stream.start()
             
-            # Start worker thread
+            # Start inference pool (once) and scheduler thread
+            if self.executor is None:
+                self.start_executor()
             self.monitoring_thread = threading.Thread(target=self.worker_thread, daemon=True)
             self.monitoring_thread.start()
             
@@ -202,9 +418,30 @@ class StreamlinedVoiceSystem:
             st.error(f"Error starting monitoring: {str(e)}")
             return False
     
+    def start_executor(self):
+        """Create the inference pool, replacing any previous one"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        self.in_flight = set()
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.EMBED_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=voice_inference.init_encoder
+        )
+    
     def stop_monitoring(self):
         """Stop monitoring"""
         self.is_monitoring = False
+        self.close_stream()
+        for future in list(self.in_flight):
+            future.cancel()
+        
+        # Let the scheduler exit before a restart resets the ring position
+        if hasattr(self, 'monitoring_thread'):
+            self.monitoring_thread.join()
+    
+    def close_stream(self):
+        """Stop and close the audio input stream"""
         try:
             if hasattr(self, 'stream'):
                 self.stream.stop()
@@ -217,12 +454,14 @@ class StreamlinedVoiceSystem:
         try:
             # Save uploaded file
             ref_path = self.REF_DIR / f"{name}.wav"
+            audio_bytes = audio_file.getvalue()
             with open(ref_path, 'wb') as f:
-                f.write(audio_file.getvalue())
+                f.write(audio_bytes)
             
             # Create embedding
-            embedding = self.enc.embed_utterance(preprocess_wav(ref_path))
+            embedding = self.embed_reference(ref_path, audio_bytes)
             self.refs[name] = embedding
+            self.append_ref_embedding(name, embedding)
             
             return True
         except Exception as e:
@@ -234,15 +473,59 @@ class StreamlinedVoiceSystem:
 def get_voice_system():
     return StreamlinedVoiceSystem()
 
+# Chart builders
+def build_call_stats_pie(authorized_calls, blocked_calls):
+    """Build the authorized/blocked pie chart"""
+    import plotly.graph_objects as go
+    
+    fig = go.Figure(data=[go.Pie(
+        labels=['Authorized', 'Blocked'],
+        values=[authorized_calls, blocked_calls],
+        marker_colors=['#28a745', '#dc3545']
+    )])
+    fig.update_layout(height=300, showlegend=True)
+    return fig
+
+def build_confidence_gauge(confidence, threshold):
+    """Build the live confidence gauge"""
+    import plotly.graph_objects as go
+    
+    fig = go.Figure(go.Indicator(
+        mode = "gauge+number",
+        value = confidence,
+        domain = {'x': [0, 1], 'y': [0, 1]},
+        title = {'text': "Confidence"},
+        gauge = {
+            'axis': {'range': [None, 1]},
+            'bar': {'color': "darkblue"},
+            'steps': [
+                {'range': [0, 0.5], 'color': "lightgray"},
+                {'range': [0.5, 0.75], 'color': "yellow"},
+                {'range': [0.75, 1], 'color': "green"}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': threshold
+            }
+        }
+    ))
+    fig.update_layout(height=200, margin={'l': 20, 'r': 20, 't': 40, 'b': 20})
+    return fig
+
 # Main Dashboard
 def main():
-    # Header
-    st.markdown("""
-    <div class="main-header">
-        🔊 Voice Recognition Security Dashboard
-        <br><small>Real-Time Scam Prevention System</small>
-    </div>
-    """, unsafe_allow_html=True)
+    # Page configuration lives here rather than at module level because
+    # spawned inference workers re-run this script as __mp_main__
+    st.set_page_config(
+        page_title="Voice Recognition Security Dashboard",
+        page_icon="🔊",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    
+    # Styles and header in a single element
+    st.markdown(CUSTOM_CSS + HEADER_HTML, unsafe_allow_html=True)
     
     # Initialize system
     voice_system = get_voice_system()
@@ -271,12 +554,12 @@ def main():
         
         # Quick Stats
         st.subheader("📊 Quick Stats")
+        stats = voice_system.session_stats
         st.metric("Known Voices", len(voice_system.refs))
-        st.metric("Total Calls", voice_system.session_stats['total_calls'])
+        st.metric("Total Calls", stats['total_calls'])
         
-        if voice_system.session_stats['total_calls'] > 0:
-            block_rate = (voice_system.session_stats['blocked_calls'] / voice_system.session_stats['total_calls']) * 100
-            st.metric("Block Rate", f"{block_rate:.1f}%")
+        if stats['total_calls'] > 0:
+            st.metric("Block Rate", f"{voice_system.block_rate():.1f}%")
     
     # Page routing
     if page == "🏠 Dashboard":
@@ -288,9 +571,49 @@ def main():
     elif page == "⚙️ Settings":
         settings_page(voice_system)
 
+def registered_voices_df(voice_system, column, value):
+    """Registered-voice table, rebuilt only when the set of voices changes"""
+    names = tuple(voice_system.refs.keys())
+    cache = st.session_state.setdefault('voices_df_cache', {})
+    cached = cache.get(column)
+    if cached is not None and cached[0] == names:
+        return cached[1]
+    
+    import pandas as pd
+    
+    df = pd.DataFrame({
+        "Name": list(names),
+        "Status": ["✅ Active"] * len(names),
+        column: [value] * len(names)
+    })
+    cache[column] = (names, df)
+    return df
+
+def format_time(dt):
+    """Format a timestamp as HH:MM:SS"""
+    return f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
+
+def activity_entry_html(call):
+    """Format a call result as a recent-activity entry"""
+    time_str = format_time(call['timestamp'])
+    
+    if call['status'] == 'Authorized':
+        return (
+            '<div class="authorized-alert">'
+            f'<strong>✅ {time_str}</strong> - {call["caller"]} (Confidence: {call["confidence"]:.2f})'
+            '</div>'
+        )
+    return (
+        '<div class="blocked-alert">'
+        f'<strong>🚫 {time_str}</strong> - Unknown Caller Blocked (Confidence: {call["confidence"]:.2f})'
+        '</div>'
+    )
+
 def dashboard_page(voice_system):
     """Main dashboard overview"""
     
+    stats = voice_system.session_stats
+    
     # Key Metrics Row
     col1, col2, col3, col4 = st.columns(4)
     
@@ -304,21 +627,21 @@ def dashboard_page(voice_system):
     with col2:
         st.metric(
             "📞 Total Calls",
-            voice_system.session_stats['total_calls'],
+            stats['total_calls'],
             help="Total calls processed this session"
         )
     
     with col3:
         st.metric(
             "✅ Authorized",
-            voice_system.session_stats['authorized_calls'],
+            stats['authorized_calls'],
             help="Calls from known voices"
         )
     
     with col4:
         st.metric(
             "🚫 Blocked",
-            voice_system.session_stats['blocked_calls'],
+            stats['blocked_calls'],
             help="Unknown callers blocked"
         )
     
@@ -328,15 +651,12 @@ def dashboard_page(voice_system):
     with col1:
         st.subheader("📈 Call Statistics")
         
-        if voice_system.session_stats['total_calls'] > 0:
+        if stats['total_calls'] > 0:
             # Create pie chart
-            fig = go.Figure(data=[go.Pie(
-                labels=['Authorized', 'Blocked'],
-                values=[voice_system.session_stats['authorized_calls'], 
-                       voice_system.session_stats['blocked_calls']],
-                marker_colors=['#28a745', '#dc3545']
-            )])
-            fig.update_layout(height=300, showlegend=True)
+            fig = build_call_stats_pie(
+                stats['authorized_calls'],
+                stats['blocked_calls']
+            )
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("No calls processed yet. Start monitoring to see statistics.")
@@ -345,10 +665,7 @@ def dashboard_page(voice_system):
         st.subheader("👥 Registered Voices")
         
         if voice_system.refs:
-            voices_df = pd.DataFrame([
-                {"Name": name, "Status": "✅ Active", "Type": "Reference"}
-                for name in voice_system.refs.keys()
-            ])
+            voices_df = registered_voices_df(voice_system, "Type", "Reference")
             st.dataframe(voices_df, use_container_width=True, hide_index=True)
         else:
             st.warning("No voices registered. Add reference voices to enable monitoring.")
@@ -357,23 +674,13 @@ def dashboard_page(voice_system):
     st.subheader("📋 Recent Activity")
     
     if 'call_results' in st.session_state and st.session_state.call_results:
-        recent_calls = st.session_state.call_results[-5:]  # Last 5 calls
+        recent_calls = islice(reversed(st.session_state.call_results), 5)  # Last 5 calls
         
-        for call in reversed(recent_calls):
-            time_str = call['timestamp'].strftime("%H:%M:%S")
-            
-            if call['status'] == 'Authorized':
-                st.markdown(f"""
-                <div class="authorized-alert">
-                <strong>✅ {time_str}</strong> - {call['caller']} (Confidence: {call['confidence']:.2f})
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"""
-                <div class="blocked-alert">
-                <strong>🚫 {time_str}</strong> - Unknown Caller Blocked (Confidence: {call['confidence']:.2f})
-                </div>
-                """, unsafe_allow_html=True)
+        # Render all entries in a single element
+        st.markdown(
+            "\n".join(activity_entry_html(call) for call in recent_calls),
+            unsafe_allow_html=True
+        )
     else:
         st.info("No recent activity. Start live monitoring to see results here.")
 
@@ -382,6 +689,16 @@ def live_monitor_page(voice_system):
     
     st.header("🔴 Live Voice Monitoring")
     
+    live_monitor_controls(voice_system)
+    
+    # Live Results
+    if st.session_state.get('monitoring', False):
+        live_results_panel(voice_system)
+
+@st.fragment
+def live_monitor_controls(voice_system):
+    """Start/stop controls for live monitoring"""
+    
     # Control Buttons
     col1, col2, col3 = st.columns([1, 1, 2])
     
@@ -405,92 +722,81 @@ def live_monitor_page(voice_system):
     with col3:
         if st.session_state.get('monitoring', False):
             st.info("🎤 **LISTENING** - System is actively monitoring for incoming calls")
+        elif voice_system.monitor_error:
+            st.error(f"❌ **STOPPED** - {voice_system.monitor_error}")
         else:
             st.warning("⚫ **INACTIVE** - Click Start Monitor to begin")
+
+@st.fragment(run_every=2)
+def live_results_panel(voice_system):
+    """Live detection results, refreshed on a timer"""
+    st.markdown("### 🎯 Live Detection Results")
     
-    # Live Results
-    if st.session_state.get('monitoring', False):
-        st.markdown("### 🎯 Live Detection Results")
-        
-        # Process new results
-        new_results = []
-        while not voice_system.result_queue.empty():
-            try:
-                result = voice_system.result_queue.get_nowait()
-                new_results.append(result)
-            except:
-                break
-        
-        # Update session state
-        if 'call_results' not in st.session_state:
-            st.session_state.call_results = []
+    # Monitoring stopped itself after repeated inference failures
+    if not voice_system.is_monitoring:
+        st.session_state.monitoring = False
+        st.rerun()
+    
+    # Process new results
+    new_results = []
+    while not voice_system.result_queue.empty():
+        try:
+            result = voice_system.result_queue.get_nowait()
+            new_results.append(result)
+        except:
+            break
+    
+    # Update session state
+    if 'call_results' not in st.session_state:
+        st.session_state.call_results = deque(maxlen=20)  # Keep last 20
+    
+    if new_results:
+        st.session_state.call_results.extend(new_results)
+    
+    # Display latest result
+    if st.session_state.call_results:
+        latest = st.session_state.call_results[-1]
         
-        if new_results:
-            st.session_state.call_results.extend(new_results)
-            st.session_state.call_results = st.session_state.call_results[-20:]  # Keep last 20
+        col1, col2 = st.columns([2, 1])
         
-        # Display latest result
-        if st.session_state.call_results:
-            latest = st.session_state.call_results[-1]
-            
-            col1, col2 = st.columns([2, 1])
-            
-            with col1:
-                if latest['status'] == 'Authorized':
-                    st.markdown(f"""
-                    <div class="authorized-alert">
-                    <h4>✅ AUTHORIZED CALLER</h4>
-                    <p><strong>Caller:</strong> {latest['caller']}</p>
-                    <p><strong>Time:</strong> {latest['timestamp'].strftime("%H:%M:%S")}</p>
-                    <p><strong>Confidence:</strong> {latest['confidence']:.3f}</p>
-                    <p><strong>Action:</strong> Call Connected</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    st.markdown(f"""
-                    <div class="blocked-alert">
-                    <h4>🚫 BLOCKED CALLER</h4>
-                    <p><strong>Status:</strong> Unknown Voice Detected</p>
-                    <p><strong>Time:</strong> {latest['timestamp'].strftime("%H:%M:%S")}</p>
-                    <p><strong>Confidence:</strong> {latest['confidence']:.3f}</p>
-                    <p><strong>Action:</strong> Potential Scam - Call Blocked</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-            
-            with col2:
-                # Confidence gauge
-                fig = go.Figure(go.Indicator(
-                    mode = "gauge+number",
-                    value = latest['confidence'],
-                    domain = {'x': [0, 1], 'y': [0, 1]},
-                    title = {'text': "Confidence"},
-                    gauge = {
-                        'axis': {'range': [None, 1]},
-                        'bar': {'color': "darkblue"},
-                        'steps': [
-                            {'range': [0, 0.5], 'color': "lightgray"},
-                            {'range': [0.5, 0.75], 'color': "yellow"},
-                            {'range': [0.75, 1], 'color': "green"}
-                        ],
-                        'threshold': {
-                            'line': {'color': "red", 'width': 4},
-                            'thickness': 0.75,
-                            'value': voice_system.THRESHOLD
-                        }
-                    }
-                ))
-                fig.update_layout(height=200, margin={'l': 20, 'r': 20, 't': 40, 'b': 20})
-                st.plotly_chart(fig, use_container_width=True)
+        with col1:
+            if latest['status'] == 'Authorized':
+                st.markdown(f"""
+                <div class="authorized-alert">
+                <h4>✅ AUTHORIZED CALLER</h4>
+                <p><strong>Caller:</strong> {latest['caller']}</p>
+                <p><strong>Time:</strong> {format_time(latest['timestamp'])}</p>
+                <p><strong>Confidence:</strong> {latest['confidence']:.3f}</p>
+                <p><strong>Action:</strong> Call Connected</p>
+                </div>
+                """, unsafe_allow_html=True)
+            else:
+                st.markdown(f"""
+                <div class="blocked-alert">
+                <h4>🚫 BLOCKED CALLER</h4>
+                <p><strong>Status:</strong> Unknown Voice Detected</p>
+                <p><strong>Time:</strong> {format_time(latest['timestamp'])}</p>
+                <p><strong>Confidence:</strong> {latest['confidence']:.3f}</p>
+                <p><strong>Action:</strong> Potential Scam - Call Blocked</p>
+                </div>
+                """, unsafe_allow_html=True)
         
-        # Auto-refresh
-        time.sleep(2)
-        st.rerun()
+        with col2:
+            # Confidence gauge
+            fig = build_confidence_gauge(float(latest['confidence']), voice_system.THRESHOLD)
+            st.plotly_chart(fig, use_container_width=True)
 
 def register_voice_page(voice_system):
     """Voice registration page"""
     
     st.header("👤 Register New Voice")
     
+    # Confirmation from the previous run
+    registered_voice = st.session_state.pop('registered_voice', None)
+    if registered_voice:
+        st.success(f"🎉 Successfully registered voice for **{registered_voice}**!")
+        st.balloons()
+    
     # Instructions
     st.info("""
     **📋 Instructions:**
@@ -524,10 +830,7 @@ def register_voice_page(voice_system):
                 success = voice_system.add_reference_voice(name, audio_file)
             
             if success:
-                st.success(f"🎉 Successfully registered voice for **{name}**!")
-                st.balloons()
-                voice_system.load_references()  # Refresh references
-                time.sleep(2)
+                st.session_state.registered_voice = name  # Confirm after rerun
                 st.rerun()
             else:
                 st.error("❌ Failed to register voice. Please try again with a different audio file.")
@@ -538,15 +841,7 @@ def register_voice_page(voice_system):
     if voice_system.refs:
         st.subheader("👥 Currently Registered Voices")
         
-        voices_data = []
-        for name in voice_system.refs.keys():
-            voices_data.append({
-                "Name": name,
-                "Status": "✅ Active",
-                "Added": "Available"
-            })
-        
-        df = pd.DataFrame(voices_data)
+        df = registered_voices_df(voice_system, "Added", "Available")
         st.dataframe(df, use_container_width=True, hide_index=True)
 
 def settings_page(voice_system):
@@ -591,10 +886,7 @@ def settings_page(voice_system):
     with col2:
         if st.button("🗑️ Clear All Voices", type="secondary"):
             if st.checkbox("I confirm I want to delete all registered voices"):
-                voice_system.refs = {}
-                # Clear files
-                for wav_file in voice_system.REF_DIR.glob("*.wav"):
-                    wav_file.unlink()
+                voice_system.clear_references()
                 st.success("All voices cleared!")
                 st.rerun()
 # Add this to your existing streamlit_dashboard.py
@@ -663,6 +955,6 @@ if __name__ == "__main__":
     if 'monitoring' not in st.session_state:
         st.session_state.monitoring = False
     if 'call_results' not in st.session_state:
-        st.session_state.call_results = []
+        st.session_state.call_results = deque(maxlen=20)
     
     main()
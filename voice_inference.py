@@ -0,0 +1,64 @@
+import numpy as np
+
+# Loudness target used by resemblyzer's preprocess_wav
+TARGET_DBFS = -30
+TARGET_RMS = 10 ** (TARGET_DBFS / 20)
+
+# Windows quieter than this hold no speech worth embedding
+SILENCE_DBFS = -50
+SILENCE_RMS = 10 ** (SILENCE_DBFS / 20)
+
+# Partial-utterance settings used by VoiceEncoder.embed_utterance
+PARTIALS_RATE = 1.3
+PARTIALS_MIN_COVERAGE = 0.75
+
+# Encoder owned by this worker process
+encoder = None
+
+def init_encoder():
+    """Load the voice encoder once per worker process"""
+    global encoder
+    from resemblyzer import VoiceEncoder
+    encoder = VoiceEncoder()
+
+def normalize_window(window):
+    """Remove DC offset and raise a quiet window to the target loudness in place"""
+    window -= window.mean()
+    rms = np.sqrt(np.dot(window, window) / len(window))
+    # Silence is dropped, as preprocess_wav would trim it, and like its
+    # increase_only normalization loud windows are never turned down
+    if rms < SILENCE_RMS:
+        return None
+    if rms < TARGET_RMS:
+        window *= TARGET_RMS / rms
+    return window
+
+def embed_windows(windows):
+    """Embed equal-length audio windows with a single encoder forward pass"""
+    import torch
+    from resemblyzer import audio
+
+    # Silent windows yield no embedding
+    windows = [w for w in windows if normalize_window(w) is not None]
+    if not windows:
+        return np.empty((0, 0), dtype=np.float32)
+
+    # Same partial slicing and zero padding as embed_utterance, shared by all windows
+    n_samples = len(windows[0])
+    wav_slices, mel_slices = encoder.compute_partial_slices(
+        n_samples, PARTIALS_RATE, PARTIALS_MIN_COVERAGE
+    )
+    pad = max(0, wav_slices[-1].stop - n_samples)
+
+    mels = []
+    for window in windows:
+        wav = np.pad(window, (0, pad), "constant")
+        mel = audio.wav_to_mel_spectrogram(wav)
+        mels.extend(mel[s] for s in mel_slices)
+
+    with torch.no_grad():
+        partials = encoder(torch.from_numpy(np.array(mels)).to(encoder.device)).cpu().numpy()
+
+    # Average each window's partials and L2-normalize, as embed_utterance does
+    raw = partials.reshape(len(windows), len(mel_slices), -1).mean(axis=1)
+    return raw / np.linalg.norm(raw, axis=1, keepdims=True)